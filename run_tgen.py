@@ -24,7 +24,9 @@ sample_gen -- sampling generation (oracle experiment; rather obsolete)
 
 asearch_gen -- generate using the A*search sentence planner
     - arguments: [-e eval-ttrees-file] [-s eval-ttrees-selector] [-d debug-output] [-w output-ttrees] \\
-                 [-c config] candgen-model percrank-model test-das
+                 [-c config] [-j parallel-jobs] candgen-model percrank-model test-das
+                 * j = number of parallel processes to use for generation (on the local machine);
+                       with j > 1, debug output (-d) only covers the main process, not the workers
 
 treecl_train -- train a tree classifier (part of candidate generator, accessible externally here)
     - arguments: config train-das train-trees treecl-model-file
@@ -46,83 +48,72 @@ rerank_cl_eval -- evaluate the reranking classifier (part of seq2seq generator,
     - arguments: [-l language] [-s selector] rerank-cl-model test-das test-sents
 """
 
-from __future__ import unicode_literals
 import sys
-from getopt import getopt
 import platform
 import os
 from argparse import ArgumentParser
 
 from tgen.config import Config
-from tgen.logf import log_info, set_debug_stream, log_debug, log_warn
-from tgen.futil import file_stream, read_das, read_ttrees, chunk_list, add_bundle_text, \
-    trees_from_doc, ttrees_from_doc, write_ttrees, tokens_from_doc, read_tokens, write_tokens, \
+from tgen.logf import log_info, set_debug_stream, log_debug, log_warn, flush_debug_stream
+from tgen.futil import file_stream, read_das, read_ttrees, chunk_iter, add_bundle_text, \
+    ttrees_from_doc, write_ttrees, tokens_from_doc, read_tokens, write_tokens, \
     postprocess_tokens, create_ttree_doc
-from tgen.candgen import RandomCandidateGenerator
-from tgen.rank import PerceptronRanker
-from tgen.planner import ASearchPlanner, SamplingPlanner
-from tgen.eval import p_r_f1_from_counts, corr_pred_gold, f1_from_counts, ASearchListsAnalyzer, \
-    EvalTypes, Evaluator
-from tgen.tree import TreeData
-from tgen.parallel_percrank_train import ParallelRanker
 from tgen.debug import exc_info_hook
 from tgen.rnd import rnd
-from tgen.bleu import BLEUMeasure
-from tgen.seq2seq import Seq2SeqBase, Seq2SeqGen
-from tgen.parallel_seq2seq_train import ParallelSeq2SeqTraining
-from tgen.tfclassif import RerankingClassifier
+
+# NB: all other modules (candidate generator, rankers, planners, seq2seq, evaluation) are imported
+# only within the actions that need them, so that each action loads only what it uses
 
 # Start IPdb on error in interactive mode
 sys.excepthook = exc_info_hook
 
 
 def candgen_train(args):
-    opts, files = getopt(args, 'p:lnc:sd:t:')
+    from tgen.candgen import RandomCandidateGenerator
+
+    ap = ArgumentParser(prog=' '.join(sys.argv[0:2]))
+    ap.add_argument('-p', '--prune-threshold', type=int, default=1,
+                    help='Minimum number of occurrences to keep a child type (default: 1)')
+    ap.add_argument('-d', '--debug-logfile', type=str, help='Debug output file name')
+    ap.add_argument('-l', '--parent-lemmas', action='store_true',
+                    help='Create lexicalized candgen (limit using parent lemmas as well as formemes)')
+    ap.add_argument('-n', '--node-limits', action='store_true',
+                    help='Engage limits on number of nodes (on depth levels + total number)')
+    ap.add_argument('-c', '--compatibility', type=str,
+                    help='DAI-node compatibility type (lemma|node), optionally with a limit (type:limit)')
+    ap.add_argument('-s', '--compatible-slots', action='store_true',
+                    help='Enforce compatibility for slots as well')
+    ap.add_argument('-t', '--tree-classif', type=str, help='Tree classifier configuration file')
+    ap.add_argument('fname_da_train', type=str, help='Training DAs file path')
+    ap.add_argument('fname_ttrees_train', type=str, help='Training t-trees file path')
+    ap.add_argument('fname_cand_model', type=str, help='Path for the output trained model')
+    args = ap.parse_args(args)
+
+    if args.debug_logfile:
+        set_debug_stream(file_stream(args.debug_logfile, mode='w'))
 
-    prune_threshold = 1
-    parent_lemmas = False
-    node_limits = False
-    comp_type = None
+    comp_type = args.compatibility
     comp_limit = None
-    comp_slots = False
-    tree_classif = False
-
-    for opt, arg in opts:
-        if opt == '-p':
-            prune_threshold = int(arg)
-        elif opt == '-d':
-            set_debug_stream(file_stream(arg, mode='w'))
-        elif opt == '-l':
-            parent_lemmas = True
-        elif opt == '-n':
-            node_limits = True
-        elif opt == '-c':
-            comp_type = arg
-            if ':' in comp_type:
-                comp_type, comp_limit = comp_type.split(':', 1)
-                comp_limit = int(comp_limit)
-        elif opt == '-t':
-            tree_classif = Config(arg)
-        elif opt == '-s':
-            comp_slots = True
-
-    if len(files) != 3:
-        sys.exit("Invalid arguments.\n" + __doc__)
-    fname_da_train, fname_ttrees_train, fname_cand_model = files
+    if comp_type and ':' in comp_type:
+        comp_type, comp_limit = comp_type.split(':', 1)
+        comp_limit = int(comp_limit)
 
     log_info('Training candidate generator...')
-    candgen = RandomCandidateGenerator({'prune_threshold': prune_threshold,
-                                        'parent_lemmas': parent_lemmas,
-                                        'node_limits': node_limits,
+    candgen = RandomCandidateGenerator({'prune_threshold': args.prune_threshold,
+                                        'parent_lemmas': args.parent_lemmas,
+                                        'node_limits': args.node_limits,
                                         'compatible_dais_type': comp_type,
                                         'compatible_dais_limit': comp_limit,
-                                        'compatible_slots': comp_slots,
-                                        'tree_classif': tree_classif})
-    candgen.train(fname_da_train, fname_ttrees_train)
-    candgen.save_to_file(fname_cand_model)
+                                        'compatible_slots': args.compatible_slots,
+                                        'tree_classif': (Config(args.tree_classif)
+                                                         if args.tree_classif else False)})
+    candgen.train(args.fname_da_train, args.fname_ttrees_train)
+    candgen.save_to_file(args.fname_cand_model)
 
 
 def rerank_cl_train(args):
+    from tgen.seq2seq import Seq2SeqBase
+    from tgen.tfclassif import RerankingClassifier
 
     ap = ArgumentParser(prog=' '.join(sys.argv[0:2]))
     ap.add_argument('-a', '--add-to-seq2seq', type=str,
@@ -150,54 +141,52 @@ def rerank_cl_train(args):
 def treecl_train(args):
     from tgen.classif import TreeClassifier
 
-    opts, files = getopt(args, '')
-
-    if len(files) != 4:
-        sys.exit("Invalid arguments.\n" + __doc__)
-    fname_config, fname_da_train, fname_trees_train, fname_cl_model = files
+    ap = ArgumentParser(prog=' '.join(sys.argv[0:2]))
+    ap.add_argument('fname_config', type=str, help='Tree classifier configuration file path')
+    ap.add_argument('fname_da_train', type=str, help='Training DAs file path')
+    ap.add_argument('fname_trees_train', type=str, help='Training trees file path')
+    ap.add_argument('fname_cl_model', type=str, help='Path for the output trained model')
+    args = ap.parse_args(args)
 
-    config = Config(fname_config)
+    config = Config(args.fname_config)
     treecl = TreeClassifier(config)
 
-    treecl.train(fname_da_train, fname_trees_train)
-    treecl.save_to_file(fname_cl_model)
+    treecl.train(args.fname_da_train, args.fname_trees_train)
+    treecl.save_to_file(args.fname_cl_model)
 
 
 def percrank_train(args):
-    opts, files = getopt(args, 'c:d:s:j:w:e:r:')
-    candgen_model = None
-    train_size = 1.0
-    parallel = False
-    jobs_number = 0
-    work_dir = None
-    experiment_id = None
-
-    for opt, arg in opts:
-        if opt == '-d':
-            set_debug_stream(file_stream(arg, mode='w'))
-        elif opt == '-s':
-            train_size = float(arg)
-        elif opt == '-c':
-            candgen_model = arg
-        elif opt == '-j':
-            parallel = True
-            jobs_number = int(arg)
-        elif opt == '-w':
-            work_dir = arg
-        elif opt == '-e':
-            experiment_id = arg
-        elif opt == '-r' and arg:
-            rnd.seed(arg)
-
-    if len(files) != 4:
-        sys.exit(__doc__)
+    from tgen.rank import PerceptronRanker
 
-    fname_rank_config, fname_train_das, fname_train_ttrees, fname_rank_model = files
+    ap = ArgumentParser(prog=' '.join(sys.argv[0:2]))
+    ap.add_argument('-c', '--candgen-model', type=str,
+                    help='Candidate generator model (overrides the one in ranker config)')
+    ap.add_argument('-d', '--debug-logfile', type=str, help='Debug output file name')
+    ap.add_argument('-s', '--train-size', type=float, default=1.0,
+                    help='Portion of the training data to use (default: 1.0)')
+    ap.add_argument('-j', '--jobs', type=int, help='Number of parallel jobs to use')
+    ap.add_argument('-w', '--work-dir', type=str, help='Main working directory for parallel jobs')
+    ap.add_argument('-e', '--experiment-id', type=str,
+                    help='Experiment ID for parallel jobs (used as job name prefix)')
+    ap.add_argument('-r', '--random-seed', type=str,
+                    help='Initial random seed (used as string).')
+    ap.add_argument('fname_rank_config', type=str, help='Ranker configuration file path')
+    ap.add_argument('fname_train_das', type=str, help='Training DAs file path')
+    ap.add_argument('fname_train_ttrees', type=str, help='Training t-trees file path')
+    ap.add_argument('fname_rank_model', type=str, help='Path for the output trained model')
+    args = ap.parse_args(args)
+
+    if args.debug_logfile:
+        set_debug_stream(file_stream(args.debug_logfile, mode='w'))
+    if args.random_seed:
+        rnd.seed(args.random_seed)
+
+    fname_rank_config = args.fname_rank_config
     log_info('Training perceptron ranker...')
 
     rank_config = Config(fname_rank_config)
-    if candgen_model:
-        rank_config['candgen_model'] = candgen_model
+    if args.candgen_model:
+        rank_config['candgen_model'] = args.candgen_model
     if rank_config.get('nn'):
         from tgen.rank_nn import SimpleNNRanker, EmbNNRanker
         if rank_config['nn'] in ['emb', 'emb_trees', 'emb_prev']:
@@ -209,19 +198,21 @@ def percrank_train(args):
 
     log_info('Using %s for ranking' % ranker_class.__name__)
 
-    if not parallel:
+    if args.jobs is None:
         ranker = ranker_class(rank_config)
     else:
-        rank_config['jobs_number'] = jobs_number
+        from tgen.parallel_percrank_train import ParallelRanker
+        rank_config['jobs_number'] = args.jobs
+        work_dir = args.work_dir
         if work_dir is None:
             work_dir, _ = os.path.split(fname_rank_config)
-        ranker = ParallelRanker(rank_config, work_dir, experiment_id, ranker_class)
+        ranker = ParallelRanker(rank_config, work_dir, args.experiment_id, ranker_class)
 
-    ranker.train(fname_train_das, fname_train_ttrees, data_portion=train_size)
+    ranker.train(args.fname_train_das, args.fname_train_ttrees, data_portion=args.train_size)
 
     # avoid the "maximum recursion depth exceeded" error
     sys.setrecursionlimit(100000)
-    ranker.save_to_file(fname_rank_model)
+    ranker.save_to_file(args.fname_rank_model)
 
 
 def seq2seq_train(args):
@@ -267,11 +258,13 @@ def seq2seq_train(args):
     if args.tb_summary_dir:  # override Tensorboard setting
         config['tb_summary_dir'] = args.tb_summary_dir
     if args.jobs:  # parallelize when training
+        from tgen.parallel_seq2seq_train import ParallelSeq2SeqTraining
         config['jobs_number'] = args.jobs
         if not args.work_dir:
             work_dir, _ = os.path.split(args.seq2seq_config_file)
         generator = ParallelSeq2SeqTraining(config, args.work_dir or work_dir, args.experiment_id)
     else:  # just a single training instance
+        from tgen.seq2seq import Seq2SeqGen
         generator = Seq2SeqGen(config)
 
     generator.train(args.da_train_file, args.tree_train_file,
@@ -284,22 +277,29 @@ def seq2seq_train(args):
 
 def sample_gen(args):
     from pytreex.core.document import Document
-    opts, files = getopt(args, 'r:n:o:w:')
-    num_to_generate = 1
-    oracle_eval_file = None
-    fname_ttrees_out = None
-
-    for opt, arg in opts:
-        if opt == '-n':
-            num_to_generate = int(arg)
-        elif opt == '-o':
-            oracle_eval_file = arg
-        elif opt == '-w':
-            fname_ttrees_out = arg
-
-    if len(files) != 2:
-        sys.exit(__doc__)
-    fname_cand_model, fname_da_test = files
+    from tgen.candgen import RandomCandidateGenerator
+    from tgen.planner import SamplingPlanner
+    from tgen.eval import p_r_f1_from_counts, corr_pred_gold, f1_from_counts
+
+    ap = ArgumentParser(prog=' '.join(sys.argv[0:2]))
+    ap.add_argument('-n', '--trees-per-da', type=int, default=1,
+                    help='Number of trees to generate for each DA (default: 1)')
+    ap.add_argument('-o', '--oracle-eval-file', type=str,
+                    help='A ttree file for oracle evaluation')
+    ap.add_argument('-w', '--output-file', type=str, help='Output ttree file')
+    ap.add_argument('-r', '--random-seed', type=str,
+                    help='Initial random seed (used as string).')
+    ap.add_argument('fname_cand_model', type=str, help='Trained candidate generator model')
+    ap.add_argument('fname_da_test', type=str, help='Input DAs for generation')
+    args = ap.parse_args(args)
+
+    if args.random_seed:
+        rnd.seed(args.random_seed)
+
+    num_to_generate = args.trees_per_da
+    oracle_eval_file = args.oracle_eval_file
+    fname_ttrees_out = args.output_file
+    fname_cand_model, fname_da_test = args.fname_cand_model, args.fname_da_test
 
     # load model
     log_info('Initializing...')
@@ -310,26 +310,33 @@ def sample_gen(args):
     tgen = SamplingPlanner({'candgen': candgen, 'ranker': ranker})
     # generate
     log_info('Generating...')
-    gen_doc = Document()
+    # only build the output document if the trees are evaluated or written out
+    gen_doc = None
+    if oracle_eval_file is not None or fname_ttrees_out is not None:
+        gen_doc = Document()
     das = read_das(fname_da_test)
     for da in das:
-        for _ in xrange(num_to_generate):  # repeat generation n times
-            tgen.generate_tree(da, gen_doc)
+        tgen.generate_trees(da, gen_doc, n=num_to_generate)
 
     # evaluate if needed
     if oracle_eval_file is not None:
         log_info('Evaluating oracle F1...')
         log_info('Loading gold data from ' + oracle_eval_file)
         gold_trees = ttrees_from_doc(read_ttrees(oracle_eval_file), tgen.language, tgen.selector)
-        gen_trees = ttrees_from_doc(gen_doc, tgen.language, tgen.selector)
+        gen_trees = (bundle.get_zone(tgen.language, tgen.selector).ttree for bundle in gen_doc.bundles)
         log_info('Gold data loaded.')
         correct, predicted, gold = 0, 0, 0
-        for gold_tree, gen_trees in zip(gold_trees, chunk_list(gen_trees, num_to_generate)):
-            # find best of predicted trees (in terms of F1)
-            _, tc, tp, tg = max([(f1_from_counts(c, p, g), c, p, g) for c, p, g
-                                 in map(lambda gen_tree: corr_pred_gold(gold_tree, gen_tree),
-                                        gen_trees)],
-                                key=lambda x: x[0])
+        for gold_tree, cand_trees in zip(gold_trees, chunk_iter(gen_trees, num_to_generate)):
+            # find best of predicted trees (in terms of F1), stop early if a perfect one is found
+            best_f1, best_counts = -1.0, None
+            for gen_tree in cand_trees:
+                counts = corr_pred_gold(gold_tree, gen_tree)
+                f1 = f1_from_counts(*counts)
+                if f1 > best_f1:
+                    best_f1, best_counts = f1, counts
+                    if f1 == 1.0:
+                        break
+            tc, tp, tg = best_counts
             correct += tc
             predicted += tp
             gold += tg
@@ -341,31 +348,116 @@ def sample_gen(args):
         write_ttrees(gen_doc, fname_ttrees_out)
 
 
+# A*search planner used by asearch_gen (set for each worker process if running in parallel)
+_asearch_planner = None
+
+
+def _init_asearch_worker(planner, debug=True):
+    """Set the A*search planner to be used in the current (worker) process.
+
+    @param planner: the A*search planner
+    @param debug: if False, turn off debug logging in this process (forked workers would \
+        otherwise write to the same debug file handle as the main process)
+    """
+    global _asearch_planner
+    _asearch_planner = planner
+    if not debug:
+        set_debug_stream(None)
+
+
+def _asearch_gen_inst(inst):
+    """Generate a tree for a single DA using the current A*search planner. If a gold tree is
+    given, analyze the final open and close lists with respect to it.
+
+    @param inst: a triple -- instance number, input DA, gold tree (or None)
+    @return: the generated tree + an ASearchListsAnalyzer object (or None if no gold tree is given)
+    """
+    from tgen.eval import ASearchListsAnalyzer
+
+    num, da, gold_tree = inst
+    tgen = _asearch_planner
+    log_debug("\n\nTREE No. %03d" % num)
+    gen_tree = tgen.generate_tree(da)
+    if gold_tree is None:
+        return gen_tree, None
+    lists_analyzer = ASearchListsAnalyzer()
+    lists_analyzer.append(gold_tree, tgen.open_list, tgen.close_list)
+    if gen_tree != gold_tree:
+        log_debug("\nDIFFING TREES:\n" + tgen.ranker.diffing_trees_with_scores(da, gold_tree, gen_tree) + "\n")
+    return gen_tree, lists_analyzer
+
+
+def asearch_gen_all(tgen, das, gold_trees=None, jobs_number=1):
+    """Generate trees for all given DAs using the A*search planner, possibly running
+    in several parallel processes (each DA is processed independently).
+
+    @param tgen: the A*search planner
+    @param das: list of input DAs
+    @param gold_trees: list of gold trees to analyze open and close lists against (optional)
+    @param jobs_number: number of parallel processes (no parallelization if <= 1)
+    @return: generator of pairs -- generated tree + lists analyzer (or None), in the order of \
+        input DAs; results are yielded as soon as they are available, so they need not be all \
+        held in memory at once
+    """
+    from multiprocessing import Pool
+
+    if gold_trees is None:
+        gold_trees = [None] * len(das)
+    insts = [(num, da, gold_tree)
+             for num, (da, gold_tree) in enumerate(zip(das, gold_trees), start=1)]
+    if jobs_number <= 1:
+        _init_asearch_worker(tgen)
+        for inst in insts:
+            yield _asearch_gen_inst(inst)
+        return
+
+    # workers do not log debug output; flush the debug stream so that its buffer
+    # is not duplicated in the forked processes
+    flush_debug_stream()
+    pool = Pool(jobs_number, initializer=_init_asearch_worker, initargs=(tgen, False))
+    try:
+        for result in pool.imap(_asearch_gen_inst, insts,
+                                chunksize=max(1, len(insts) // (4 * jobs_number))):
+            yield result
+    finally:
+        pool.close()
+        pool.join()
+
+
 def asearch_gen(args):
     """A*search generation"""
     from pytreex.core.document import Document
+    from tgen.candgen import RandomCandidateGenerator
+    from tgen.rank import PerceptronRanker
+    from tgen.planner import ASearchPlanner
+    from tgen.eval import p_r_f1_from_counts, ASearchListsAnalyzer, EvalTypes, Evaluator
+    from tgen.tree import TreeData
 
-    opts, files = getopt(args, 'e:d:w:c:s:')
-    eval_file = None
-    fname_ttrees_out = None
-    cfg_file = None
-    eval_selector = ''
-
-    for opt, arg in opts:
-        if opt == '-e':
-            eval_file = arg
-        elif opt == '-s':
-            eval_selector = arg
-        elif opt == '-d':
-            set_debug_stream(file_stream(arg, mode='w'))
-        elif opt == '-w':
-            fname_ttrees_out = arg
-        elif opt == '-c':
-            cfg_file = arg
-
-    if len(files) != 3:
-        sys.exit('Invalid arguments.\n' + __doc__)
-    fname_cand_model, fname_rank_model, fname_da_test = files
+    ap = ArgumentParser(prog=' '.join(sys.argv[0:2]))
+    ap.add_argument('-e', '--eval-file', type=str, help='A ttree file for evaluation')
+    ap.add_argument('-s', '--eval-selector', type=str, default='',
+                    help='Selector for reference trees in the evaluation file')
+    ap.add_argument('-d', '--debug-logfile', type=str, help='Debug output file name')
+    ap.add_argument('-w', '--output-file', type=str, help='Output ttree file')
+    ap.add_argument('-c', '--config', type=str, help='A*search planner configuration file')
+    ap.add_argument('-j', '--jobs', type=int, default=1,
+                    help='Number of parallel processes to use for generation (default: 1); ' +
+                    'with more than 1, debug output (-d) is only written by the main process')
+    ap.add_argument('fname_cand_model', type=str, help='Trained candidate generator model')
+    ap.add_argument('fname_rank_model', type=str, help='Trained perceptron ranker model')
+    ap.add_argument('fname_da_test', type=str, help='Input DAs for generation')
+    args = ap.parse_args(args)
+
+    if args.debug_logfile:
+        set_debug_stream(file_stream(args.debug_logfile, mode='w'))
+
+    eval_file = args.eval_file
+    eval_selector = args.eval_selector
+    fname_ttrees_out = args.output_file
+    cfg_file = args.config
+    jobs_number = args.jobs
+    fname_cand_model, fname_rank_model, fname_da_test = (args.fname_cand_model, args.fname_rank_model,
+                                                         args.fname_da_test)
 
     log_info('Initializing...')
     candgen = RandomCandidateGenerator.load_from_file(fname_cand_model)
@@ -377,46 +469,45 @@ def asearch_gen(args):
     log_info('Generating...')
     das = read_das(fname_da_test)
 
-    if eval_file is None:
-        gen_doc = Document()
-    else:
-        eval_doc = read_ttrees(eval_file)
-        if eval_selector == tgen.selector:
-            gen_doc = Document()
-        else:
-            gen_doc = eval_doc
+    # the output document is only created if needed (see below)
+    gen_doc = None
 
     # generate and evaluate
     if eval_file is not None:
+        eval_doc = read_ttrees(eval_file)
         # generate + analyze open&close lists
+        # (gold t-trees and their TreeData versions are extracted just once, for both
+        # open&close lists analysis and evaluation)
+        eval_ttrees = ttrees_from_doc(eval_doc, tgen.language, eval_selector)
+        gold_trees = [TreeData.from_ttree(eval_ttree) for eval_ttree in eval_ttrees]
+        # generated trees always go to a separate document (not to the evaluation document,
+        # so that it does not grow during generation); each generated tree is only kept
+        # as a t-tree in this document, it is scored right away
+        gen_doc = Document()
         lists_analyzer = ASearchListsAnalyzer()
-        for num, (da, gold_tree) in enumerate(zip(das,
-                                                  trees_from_doc(eval_doc, tgen.language, eval_selector)),
-                                              start=1):
-            log_debug("\n\nTREE No. %03d" % num)
-            gen_tree = tgen.generate_tree(da, gen_doc)
-            lists_analyzer.append(gold_tree, tgen.open_list, tgen.close_list)
-            if gen_tree != gold_tree:
-                log_debug("\nDIFFING TREES:\n" + tgen.ranker.diffing_trees_with_scores(da, gold_tree, gen_tree) + "\n")
+        gen_scores = []
+        for da, (gen_tree, inst_analyzer) in zip(das, asearch_gen_all(tgen, das, gold_trees,
+                                                                      jobs_number)):
+            tgen.save_tree(gen_doc, gen_tree, da)
+            gen_scores.append(ranker.score(gen_tree, da))
+            lists_analyzer.merge(inst_analyzer)
 
         log_info('Gold tree BEST: %.4f, on CLOSE: %.4f, on ANY list: %4f' % lists_analyzer.stats())
 
         # evaluate the generated trees against golden trees
-        eval_ttrees = ttrees_from_doc(eval_doc, tgen.language, eval_selector)
         gen_ttrees = ttrees_from_doc(gen_doc, tgen.language, tgen.selector)
 
         log_info('Evaluating...')
+        # collect overall stats
         evaler = Evaluator()
-        for eval_bundle, eval_ttree, gen_ttree, da in zip(eval_doc.bundles, eval_ttrees, gen_ttrees, das):
-            # add some stats about the tree directly into the output file
+        inst_counts = evaler.append_all(eval_ttrees,
+                                        gen_ttrees,
+                                        [ranker.score(gold_tree, da) for gold_tree, da in zip(gold_trees, das)],
+                                        gen_scores)
+        # add some stats about the tree directly into the output file
+        for eval_bundle, counts in zip(eval_doc.bundles, inst_counts):
             add_bundle_text(eval_bundle, tgen.language, tgen.selector + 'Xscore',
-                            "P: %.4f R: %.4f F1: %.4f" % p_r_f1_from_counts(*corr_pred_gold(eval_ttree, gen_ttree)))
-
-            # collect overall stats
-            evaler.append(eval_ttree,
-                          gen_ttree,
-                          ranker.score(TreeData.from_ttree(eval_ttree), da),
-                          ranker.score(TreeData.from_ttree(gen_ttree), da))
+                            "P: %.4f R: %.4f F1: %.4f" % p_r_f1_from_counts(*counts))
         # print overall stats
         log_info("NODE precision: %.4f, Recall: %.4f, F1: %.4f" % evaler.p_r_f1())
         log_info("DEP  precision: %.4f, Recall: %.4f, F1: %.4f" % evaler.p_r_f1(EvalTypes.DEP))
@@ -424,19 +515,34 @@ def asearch_gen(args):
         log_info("Score stats:\n * GOLD %s\n * PRED %s\n * DIFF %s" % evaler.score_stats())
         log_info("Common subtree stats:\n -- SIZE: %s\n -- ΔGLD: %s\n -- ΔPRD: %s" %
                  evaler.common_substruct_stats())
-    # just generate
+    # just generate (trees are only converted to t-trees if they are to be written out)
     else:
-        for da in das:
-            tgen.generate_tree(da, gen_doc)
+        if fname_ttrees_out is not None:
+            gen_doc = Document()
+        for da, (gen_tree, _) in zip(das, asearch_gen_all(tgen, das, jobs_number=jobs_number)):
+            if gen_doc is not None:
+                tgen.save_tree(gen_doc, gen_tree, da)
 
     # write output
     if fname_ttrees_out is not None:
         log_info('Writing output...')
+        # with different selectors, write out generated trees along with the evaluation trees
+        # and scores, i.e., merge them into the evaluation document (the t-trees are moved
+        # over, not copied)
+        if eval_file is not None and eval_selector != tgen.selector:
+            for gen_bundle in gen_doc.bundles:
+                gen_zone = gen_bundle.get_zone(tgen.language, tgen.selector)
+                eval_zone = tgen.get_target_zone(eval_doc)
+                eval_zone.ttree = gen_zone.ttree
+                eval_zone.sentence = gen_zone.sentence
+            gen_doc = eval_doc
         write_ttrees(gen_doc, fname_ttrees_out)
 
 
 def seq2seq_gen(args):
     """Sequence-to-sequence generation"""
+    from tgen.seq2seq import Seq2SeqBase
+    from tgen.eval import Evaluator
 
     ap = ArgumentParser(prog=' '.join(sys.argv[0:2]))
 
@@ -531,6 +637,9 @@ def seq2seq_gen(args):
 
 def eval_tokens(das, eval_tokens, gen_tokens):
     """Evaluate generated tokens and print out statistics."""
+    from tgen.bleu import BLEUMeasure
+    from tgen.eval import EvalTypes, Evaluator
+
     postprocess_tokens(eval_tokens, das)
     postprocess_tokens(gen_tokens, das)
 
@@ -551,6 +660,8 @@ def eval_tokens(das, eval_tokens, gen_tokens):
 
 
 def rerank_cl_eval(args):
+    from tgen.tfclassif import RerankingClassifier
+
     ap = ArgumentParser(prog=' '.join(sys.argv[0:2]))
     ap.add_argument('-l', '--language', type=str,
                     help='Override classifier language (for t-tree input files)')
@@ -573,6 +684,18 @@ def rerank_cl_eval(args):
     log_info("Penalty: %d, Total DAIs %d." % (dist, tot_len))
 
 
+# all actions accessible from the command line (action name -> function)
+ACTIONS = {'candgen_train': candgen_train,
+           'percrank_train': percrank_train,
+           'sample_gen': sample_gen,
+           'asearch_gen': asearch_gen,
+           'seq2seq_train': seq2seq_train,
+           'seq2seq_gen': seq2seq_gen,
+           'treecl_train': treecl_train,
+           'rerank_cl_train': rerank_cl_train,
+           'rerank_cl_eval': rerank_cl_eval}
+
+
 if __name__ == '__main__':
 
     if len(sys.argv) < 2:
@@ -584,26 +707,9 @@ if __name__ == '__main__':
     log_info('Running on %s version %s' % (platform.python_implementation(),
                                            platform.python_version()))
 
-    if action == 'candgen_train':
-        candgen_train(args)
-    elif action == 'percrank_train':
-        percrank_train(args)
-    elif action == 'sample_gen':
-        sample_gen(args)
-    elif action == 'asearch_gen':
-        asearch_gen(args)
-    elif action == 'seq2seq_train':
-        seq2seq_train(args)
-    elif action == 'seq2seq_gen':
-        seq2seq_gen(args)
-    elif action == 'treecl_train':
-        treecl_train(args)
-    elif action == 'rerank_cl_train':
-        rerank_cl_train(args)
-    elif action == 'rerank_cl_eval':
-        rerank_cl_eval(args)
-    else:
+    if action not in ACTIONS:
         # Unknown action
         sys.exit(("\nERROR: Unknown Tgen action: %s\n\n---" % action) + __doc__)
+    ACTIONS[action](args)
 
     log_info('Done.')
@@ -18,7 +18,10 @@ import codecs
 import sys
 import re
 import time
-import collections
+try:
+    from collections.abc import Iterable
+except ImportError:  # Python 2
+    from collections import Iterable
 from tgen.logf import log_warn
 
 """\
@@ -252,7 +255,7 @@ from __future__ import unicode_literals
             self.__dependencies.append(dependency)
         elif isinstance(dependency, int):
             self.__dependencies.append(str(dependency))
-        elif isinstance(dependency, collections.Iterable):
+        elif isinstance(dependency, Iterable):
             for dep_elem in dependency:
                 self.add_dependency(dep_elem)
         else:
@@ -273,7 +276,7 @@ from __future__ import unicode_literals
                 self.__dependencies.remove(rem)
             else:
                 raise ValueError('Cannot find dependency!')
-        elif isinstance(dependency, collections.Iterable):
+        elif isinstance(dependency, Iterable):
             for dep_elem in dependency:
                 self.remove_dependency(dep_elem)
         else:
@@ -185,16 +185,15 @@ class Evaluator(object):
         @param target_selector: selector for generated trees (used to save statistics)
         """
         log_info('Evaluating...')
-        for eval_bundle, gen_tree, in zip(eval_doc.bundles, gen_trees):
-            # add some stats about the tree directly into the output file
-            eval_ttree = eval_bundle.get_zone(language, ref_selector).ttree
-            gen_ttree = TreeNode(gen_tree)
+        # collect overall stats
+        # TODO maybe add cost somehow?
+        inst_counts = self.append_all([eval_bundle.get_zone(language, ref_selector).ttree
+                                       for eval_bundle, _ in zip(eval_doc.bundles, gen_trees)],
+                                      [TreeNode(gen_tree) for gen_tree in gen_trees])
+        # add some stats about the tree directly into the output file
+        for eval_bundle, counts in zip(eval_doc.bundles, inst_counts):
             add_bundle_text(eval_bundle, language, target_selector + 'Xscore',
-                            "P: %.4f R: %.4f F1: %.4f" %
-                            p_r_f1_from_counts(*corr_pred_gold(eval_ttree, gen_ttree)))
-            # collect overall stats
-            # TODO maybe add cost somehow?
-            self.append(eval_ttree, gen_ttree)
+                            "P: %.4f R: %.4f F1: %.4f" % p_r_f1_from_counts(*counts))
 
         # print out the overall stats
         log_info("NODE precision: %.4f, Recall: %.4f, F1: %.4f" % self.p_r_f1())
@@ -210,6 +209,8 @@ class Evaluator(object):
         @param gold: a T or TreeNode object representing the golden tree, or list of golden tokens
         @param pred: a T or TreeNode object representing the predicted tree, or list of predicted \
             tokens
+        @return: counts of correct, predicted, and gold nodes/tokens for this pair (using NODE \
+            matching for trees and TOKEN matching for tokens)
         """
         if isinstance(gold, list):  # tokens
             eval_types = [EvalTypes.TOKEN]
@@ -223,12 +224,33 @@ class Evaluator(object):
             css = common_subtree_size(gold, pred)
         self.sizes.append((gold_len, pred_len, css))
 
+        inst_counts = None
         for eval_type in eval_types:
             ccount, pcount, gcount = corr_pred_gold(gold, pred, eval_type)
             self.correct[eval_type] += ccount
             self.predicted[eval_type] += pcount
             self.gold[eval_type] += gcount
+            if inst_counts is None:
+                inst_counts = (ccount, pcount, gcount)
         self.scores.append((gold_score, pred_score))
+        return inst_counts
+
+    def append_all(self, golds, preds, gold_scores=None, pred_scores=None):
+        """Array version of append(): add all pairs of golden and predicted trees/sentences
+        to the current statistics.
+
+        @param golds: list of golden trees/sentences
+        @param preds: list of predicted trees/sentences
+        @param gold_scores: list of golden trees/sentences scores (optional)
+        @param pred_scores: list of predicted trees/sentences scores (optional)
+        @return: list of per-pair counts of correct, predicted, and gold nodes/tokens (see append())
+        """
+        if gold_scores is None:
+            gold_scores = [0.0] * len(golds)
+        if pred_scores is None:
+            pred_scores = [0.0] * len(preds)
+        return [self.append(gold, pred, gold_score, pred_score)
+                for gold, pred, gold_score, pred_score in zip(golds, preds, gold_scores, pred_scores)]
 
     def merge(self, other):
         """Merge in statistics from another Evaluator object."""
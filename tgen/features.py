@@ -16,7 +16,10 @@ from builtins import object
 from past.utils import old_div
 from collections import defaultdict
 import re
-import inspect
+try:
+    from inspect import getfullargspec as getargspec
+except ImportError:  # Python 2
+    from inspect import getargspec
 from functools import partial
 from itertools import combinations
 
@@ -409,7 +412,7 @@ class Features(object):
             except KeyError:
                 raise Exception('Unknown feature function:' + feat)
 
-            arg_num = len(inspect.getargspec(feat_func).args)
+            arg_num = len(getargspec(feat_func).args)
             if arg_num == 2:
                 pass
             elif arg_num == 3:
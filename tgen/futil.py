@@ -17,6 +17,7 @@ import pickle as pickle
 import gzip
 import regex
 import re
+from itertools import islice
 from io import IOBase, StringIO
 from codecs import StreamReader, StreamWriter
 
@@ -39,14 +40,25 @@ def file_stream(filename, mode='r', encoding='UTF-8'):
     return fh
 
 
+def read_lines(filename, encoding='UTF-8'):
+    """Read all lines of an uncompressed file at once, as one block of bytes
+    that is split into lines in one go (line-end characters are removed).
+    """
+    with open(filename, 'rb') as fh:
+        lines = fh.read().split(b'\n')
+    if not lines[-1]:  # file ending with a newline (or empty file)
+        lines.pop()
+    return [line.decode(encoding) for line in lines]
+
+
 def read_das(da_file):
     """Read dialogue acts from a file, one-per-line."""
-    das = []
-    with file_stream(da_file) as fh:
-        for line in fh:
-            da = DA.parse(line.strip())
-            das.append(da)
-    return das
+    if isinstance(da_file, (IOBase, StreamReader, StreamWriter)) or da_file.endswith('.gz'):
+        with file_stream(da_file) as fh:
+            lines = list(fh)
+    else:
+        lines = read_lines(da_file)
+    return [DA.parse(line.strip()) for line in lines]
 
 
 def read_absts(abst_file):
@@ -273,6 +285,16 @@ def chunk_list(l, n):
         yield l[i:i + n]
 
 
+def chunk_iter(it, n):
+    """Yield successive n-sized chunks (as lists) from any iterable; unlike chunk_list(),
+    this does not need the whole input in memory."""
+    it = iter(it)
+    chunk = list(islice(it, n))
+    while chunk:
+        yield chunk
+        chunk = list(islice(it, n))
+
+
 def ttrees_from_doc(ttree_doc, language, selector):
     """Given a Treex document full of t-trees, return just the array of t-trees."""
     selectors = selector.split(',')
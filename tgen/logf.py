@@ -49,6 +49,12 @@ def set_debug_stream(stream):
     debug_stream = stream
 
 
+def flush_debug_stream():
+    """Flush the debug stream, if there is any."""
+    if debug_stream is not None:
+        debug_stream.flush()
+
+
 def is_debug_stream():
     """Return True if there is a debug stream (debug logfile) set up."""
     global debug_stream
@@ -13,6 +13,10 @@ from operator import itemgetter
 import numpy as np
 import inspect
 import warnings
+try:
+    from inspect import getfullargspec as getargspec
+except ImportError:  # Python 2
+    from inspect import getargspec
 from numbers import Number
 from bisect import bisect_left
 
@@ -226,7 +230,11 @@ def _mean_and_std(X, axis=0, with_mean=True, with_std=True):
 
 # sklearn.utils.fixes
 # little danse to see if np.copy has an 'order' keyword argument
-if 'order' in inspect.getargspec(np.copy)[0]:
+try:  # Python 3 (NumPy 2's np.copy can only be introspected via signature())
+    _np_copy_args = inspect.signature(np.copy).parameters
+except AttributeError:  # Python 2
+    _np_copy_args = getargspec(np.copy).args
+if 'order' in _np_copy_args:
     def safe_copy(X):
         # Copy, but keep the order
         return np.copy(X, order='K')
@@ -287,7 +295,8 @@ class BaseEstimator(object):
 
             # introspect the constructor arguments to find the model parameters
             # to represent
-            args, varargs, kw, default = inspect.getargspec(init)
+            argspec = getargspec(init)
+            args, varargs = argspec.args, argspec.varargs
             if not varargs is None:
                 raise RuntimeError("scikit-learn estimators should always "
                                    "specify their parameters in the signature"
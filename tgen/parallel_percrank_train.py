@@ -28,7 +28,7 @@ import os
 import tempfile
 import numpy as np
 
-from rpyc import Service, connect, async
+from rpyc import Service, connect, async_
 from rpyc.utils.server import ThreadPoolServer
 
 from tgen.futil import file_stream
@@ -45,6 +45,11 @@ class ServiceConn(namedtuple('ServiceConn', ['host', 'port', 'conn'])):
     pass
 
 
+def get_feats_dump_path(dump):
+    """Return the path of the separate training features file for the given ranker dump."""
+    return dump + '.feats.npy'
+
+
 def dump_ranker(ranker, work_dir):
 
     fh = tempfile.NamedTemporaryFile(suffix='.pickle', prefix='rdump-', dir=work_dir, delete=False)
@@ -54,7 +59,14 @@ def dump_ranker(ranker, work_dir):
     train_feats = ranker.train_feats
     ranker.train_feats = None
     pickle.dump(ranker, fh, protocol=pickle.HIGHEST_PROTOCOL)
-    np.save(fh, train_feats)
+    # numeric feature matrices go to a separate file, so that workers can memory-map them
+    # and only read the data portions they actually use
+    if isinstance(train_feats, np.ndarray) and train_feats.dtype != object:
+        np.save(get_feats_dump_path(fh.name), train_feats)
+        pickle.dump(True, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    else:
+        pickle.dump(False, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        np.save(fh, train_feats)
     fh.close()
     return fh.name
 
@@ -63,7 +75,10 @@ def load_ranker(dump):
 
     with open(dump, 'rb') as fh:
         ranker = pickle.load(fh)
-        train_feats = np.load(fh)
+        if pickle.load(fh):  # features stored separately -- memory-map them (read-only)
+            train_feats = np.load(get_feats_dump_path(dump), mmap_mode='r')
+        else:
+            train_feats = np.load(fh)
         ranker.train_feats = train_feats
     return ranker
 
@@ -86,7 +101,7 @@ def get_worker_registrar_for(head):
             log_info('Worker %s:%d connected, initializing training.' % (host, port))
             conn = connect(host, port, config={'allow_pickle': True})
             # initialize the remote server (with training data etc.)
-            init_func = async(conn.root.init_training)
+            init_func = async_(conn.root.init_training)
             req = init_func(ranker_dump_path)
             # add it to the list of running services
             sc = ServiceConn(host, port, conn)
@@ -122,6 +137,8 @@ class ParallelRanker(Ranker):
         self.services = None
         self.free_services = None
         self.results = None
+        self.ranker_dump_path = None
+        self.feats_dump_path = None
         # create a local ranker instance that will be copied to all parallel workers
         # and will be used to average weights after each iteration
         self.loc_ranker = ranker_class(cfg)
@@ -174,7 +191,7 @@ class ParallelRanker(Ranker):
                         sc = self.free_services.popleft()
                         log_info('Assigning request %d / %d to %s:%d' %
                                  (iter_no, cur_portion, sc.host, sc.port))
-                        train_func = async(sc.conn.root.training_pass)
+                        train_func = async_(sc.conn.root.training_pass)
                         req = train_func(w_dump, iter_no, rnd_seeds[cur_portion],
                                          * self._get_portion_bounds(cur_portion))
                         self.pending_requests.add((sc, cur_portion, req))
@@ -208,6 +225,11 @@ class ParallelRanker(Ranker):
         finally:
             for job in self.jobs:
                 job.delete()
+            # delete the features dump (workers may memory-map it, so it cannot be deleted
+            # along with the ranker dump after the 1st iteration)
+            if self.feats_dump_path and os.path.isfile(self.feats_dump_path):
+                log_info('Removing temporary features dump at %s.' % self.feats_dump_path)
+                os.remove(self.feats_dump_path)
 
     def _check_pending_request(self, iter_no, sc, req_portion, req):
         """Check whether the given request has finished (i.e., job is loaded or job has
@@ -279,6 +301,7 @@ class ParallelRanker(Ranker):
         self.server_thread.setDaemon(True)
         self.server_thread.start()
         self.ranker_dump_path = ranker_dump_path
+        self.feats_dump_path = get_feats_dump_path(ranker_dump_path)
 
     def _get_portion_bounds(self, portion_no):
         """(Head) return the offset and size of the specified portion of the training
@@ -11,7 +11,11 @@ from builtins import zip
 from builtins import str
 from builtins import range
 from builtins import object
-from collections import deque, MutableMapping
+from collections import deque, OrderedDict
+try:
+    from collections.abc import MutableMapping
+except ImportError:  # Python 2
+    from collections import MutableMapping
 
 from .logf import log_debug
 from .tree import TreeData, TreeNode, NodeData
@@ -41,6 +45,12 @@ class CandidateList(MutableMapping):
     def __contains__(self, key):
         return key in self.members
 
+    def __len__(self):
+        return len(self.members)
+
+    def __iter__(self):
+        return iter(self.members)
+
     def __getitem__(self, key):
         return self.members[key]
 
@@ -170,6 +180,19 @@ class SentencePlanner(object):
         """
         raise NotImplementedError
 
+    def save_tree(self, gen_doc, tree, da=None):
+        """Append a generated tree to the given t-tree document (into the first bundle that does
+        not have the target zone yet).
+
+        @param gen_doc: the target PyTreex document
+        @param tree: the generated tree (a TreeData object)
+        @param da: the input DA; if given, it is saved as the zone's sentence
+        """
+        zone = self.get_target_zone(gen_doc)
+        zone.ttree = tree.create_ttree()
+        if da is not None:
+            zone.sentence = str(da)
+
     def get_target_zone(self, gen_doc):
         """Find the first bundle in the given document that does not have the target
         zone (or create it), then create the target zone and return it.
@@ -197,8 +220,29 @@ class SamplingPlanner(SentencePlanner):
         self.candgen = cfg['candgen']
 
     def generate_tree(self, da, gen_doc=None):
-        root = TreeNode(TreeData())
+        return self.generate_trees(da, gen_doc, n=1)[0]
+
+    def generate_trees(self, da, gen_doc=None, n=1):
+        """Generate the given number of trees for the given DA (each one is sampled
+        independently, but the candidate generator is initialized for the DA only once).
+
+        @param da: The input DA
+        @param gen_doc: Save the generated trees into this PyTreex document, if given
+        @param n: Number of trees to generate
+        @return: list of the generated trees
+        """
         self.candgen.init_run(da)
+        trees = []
+        for _ in range(n):
+            tree = self.sample_tree()
+            if gen_doc:
+                self.save_tree(gen_doc, tree)
+            trees.append(tree)
+        return trees
+
+    def sample_tree(self):
+        """Sample one tree (the candidate generator must be initialized for the current DA)."""
+        root = TreeNode(TreeData())
         nodes = deque([self.generate_child(root)])
         treesize = 1
         while nodes and treesize < self.MAX_TREE_SIZE:
@@ -208,10 +252,6 @@ class SamplingPlanner(SentencePlanner):
                 if child:
                     nodes.append(child)
                     treesize += 1
-        if gen_doc:
-            zone = self.get_target_zone(gen_doc)
-            zone.ttree = root.create_ttree()
-            return
         return root.tree
 
     def generate_child(self, parent):
@@ -256,9 +296,7 @@ class ASearchPlanner(SentencePlanner):
         log_debug("RESULT: %12.5f %s" % (best_score, str(best_tree)))
         # if requested, append the result
         if gen_doc:
-            zone = self.get_target_zone(gen_doc)
-            zone.ttree = best_tree.create_ttree()
-            zone.sentence = str(da)
+            self.save_tree(gen_doc, best_tree, da)
         # return the result
         return best_tree
 
@@ -337,10 +375,15 @@ class ASearchPlanner(SentencePlanner):
                 log_debug("-- IT %4d: O %5d S %12.5f -- %s" %
                           (self.num_iter, len(self.open_list), -score[1], str(cand)))
 
+        # successors of all candidates in the beam are collected, so that they are scored at once;
+        # successors already on the open list are skipped: their score would be the same
+        # (it only depends on the tree and the current DA), so they are not scored again
         successors = [succ
-                      for succ in self.candgen.get_all_successors(cand)
                       for cand in cands
-                      if succ not in self.close_list]
+                      for succ in self.candgen.get_all_successors(cand)
+                      if succ not in self.close_list and succ not in self.open_list]
+        # the same successor may be reached from several candidates in the beam: score it just once
+        successors = list(OrderedDict.fromkeys(successors))
 
         if successors:
             # add candidates with score (negative for the min-heap)
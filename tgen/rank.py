@@ -17,6 +17,8 @@ from past.utils import old_div
 from builtins import object
 import numpy as np
 import pickle as pickle
+import os
+import tempfile
 import time
 import datetime
 from collections import defaultdict, namedtuple
@@ -539,6 +541,13 @@ class FeaturesPerceptronRanker(BasePerceptronRanker):
             feats = self.normalizer.transform(feats)
         return feats[0]
 
+    def _extract_feats_all(self, trees, da):
+        """Array version of _extract_feats(), returning a 2-D matrix (one row per tree)."""
+        feats = self.vectorizer.transform([self.feats.get_features(tree, {'da': da}) for tree in trees])
+        if self.normalizer:
+            feats = self.normalizer.transform(feats)
+        return feats
+
     def _init_training(self, das_file, ttree_file, data_portion):
 
         super(FeaturesPerceptronRanker, self)._init_training(das_file, ttree_file, data_portion)
@@ -592,6 +601,53 @@ class PerceptronRanker(FeaturesPerceptronRanker):
             state['binarize'] = False
         self.__dict__ = state
 
+    @staticmethod
+    def weights_fname(model_fname):
+        """Return the name of the file where weights are stored for the given model file name."""
+        return model_fname + '.w.npy'
+
+    @staticmethod
+    def load_from_file(model_fname):
+        """Load a pre-trained model from a file. If the weights are stored separately in
+        NumPy format, they are memory-mapped (copy-on-write) instead of being read and copied."""
+        ranker = Ranker.load_from_file(model_fname)
+        # only perceptron models saved with separate weights (NN rankers have no weights file)
+        if getattr(ranker, 'w_stored_separately', False):
+            w_fname = PerceptronRanker.weights_fname(model_fname)
+            if not os.path.isfile(w_fname):
+                raise IOError('Perceptron ranker weights file %s not found (required by %s)' %
+                              (w_fname, model_fname))
+            ranker.w = np.load(w_fname, mmap_mode='c')
+            del ranker.w_stored_separately
+        return ranker
+
+    def save_to_file(self, model_fname):
+        """Save the model to a file; weights are stored separately in NumPy format
+        (see weights_fname()), so that they can be memory-mapped when loading.
+        Weights remembered after each training pass (only needed for averaging
+        during training) are not saved."""
+        w = self.w
+        if w is not None:
+            # write to a temporary file first and then rename, since the target file may be
+            # memory-mapped by this very ranker (if it was loaded from the same location)
+            w_fname = self.weights_fname(model_fname)
+            fh = tempfile.NamedTemporaryFile(suffix='.npy', prefix='wdump-',
+                                             dir=os.path.dirname(os.path.abspath(w_fname)), delete=False)
+            np.save(fh, np.asarray(w))
+            fh.close()
+            os.rename(fh.name, w_fname)
+            self.w = None
+            self.w_stored_separately = True
+        w_after_iter = self.w_after_iter
+        self.w_after_iter = []
+        try:
+            super(PerceptronRanker, self).save_to_file(model_fname)
+        finally:
+            self.w_after_iter = w_after_iter
+            if w is not None:
+                self.w = w
+                del self.w_stored_separately
+
     def _init_training(self, das_file, ttree_file, data_portion):
         # load data, determine number of features etc. etc.
         super(PerceptronRanker, self)._init_training(das_file, ttree_file, data_portion)
@@ -607,6 +663,13 @@ class PerceptronRanker(FeaturesPerceptronRanker):
     def _score(self, cand_feats):
         return np.dot(self.w, cand_feats)
 
+    def score_all(self, cand_trees, da):
+        """Array version of the score() function; all candidates are vectorized at once
+        and scored using a single matrix-vector product."""
+        if not cand_trees:
+            return []
+        return np.dot(self._extract_feats_all(cand_trees, da), self.w)
+
     def _update_weights(self, good, bad):
         """Perform a perceptron weights update (not the check if we need to update).
         Also perform differing tree updates."""